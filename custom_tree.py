@@ -1,6 +1,9 @@
 """custom_tree.py © Andrea Bistacchi"""
 
-from functools import wraps
+from bisect import bisect_left
+from functools import partial, wraps
+
+import pandas as pd
 
 from PySide6.QtWidgets import (
     QTreeWidget,
@@ -12,7 +15,7 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QComboBox,
 )
-from PySide6.QtCore import Qt, Signal, QMimeData
+from PySide6.QtCore import Qt, Signal, QMimeData, QTimer
 from PySide6.QtGui import QDrag
 
 
@@ -52,8 +55,10 @@ class DraggableButton(QPushButton):
         self.setCheckable(True)
         self.setChecked(True)
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.setMinimumSize(self.sizeHint())
-        self.setMaximumSize(self.sizeHint())
+        # Compute the style/font-metrics dependent size hint only once
+        hint = self.sizeHint()
+        self.setMinimumSize(hint)
+        self.setMaximumSize(hint)
 
     def mouseMoveEvent(self, event):
         """
@@ -119,6 +124,7 @@ class CustomHeader(QWidget):
         self.layout = QHBoxLayout(self)
         self.layout.setSpacing(0)
         self.buttons = []
+        self._centers = None
         for label in labels:
             button = DraggableButton(label)
             button.clicked.connect(self.on_button_toggled)
@@ -199,9 +205,21 @@ class CustomHeader(QWidget):
         if source_button not in self.buttons:
             return
 
+        previous_order = list(self.buttons)
         self._rearrange_button(source_button, event.position().toPoint())
-        self._update_button_list()
-        self.buttonToggled.emit()
+
+        # Mirror the layout move directly in self.buttons instead of
+        # re-walking the layout; buttons precede the trailing stretch, so the
+        # moved button's layout index is also its position in the list
+        self.buttons.remove(source_button)
+        layout_index = self.layout.indexOf(source_button)
+        self.buttons.insert(min(layout_index, len(self.buttons)), source_button)
+        self._centers = None
+
+        # Dropping a button back where it was is a no-op; do not force the
+        # tree to rebuild its hierarchy
+        if self.buttons != previous_order:
+            self.buttonToggled.emit()
 
     def _rearrange_button(self, source_button, drop_position):
         """
@@ -226,13 +244,39 @@ class CustomHeader(QWidget):
         else:
             self.layout.addWidget(source_button)
 
+    def _button_centers(self):
+        """
+        Returns the cached x-coordinates of the button centers, recomputing them
+        only when the cache has been invalidated by a layout change. Since the
+        buttons sit left-to-right in the layout the list is sorted, which allows
+        binary search in `_find_closest_button`.
+
+        :return: Sorted list of the buttons' center x-coordinates.
+        :rtype: list[int]
+        """
+        if self._centers is None:
+            self._centers = [button.geometry().center().x() for button in self.buttons]
+        return self._centers
+
+    def resizeEvent(self, event):
+        """
+        Invalidates the cached button centers when the widget is resized, since
+        the layout will move the buttons.
+
+        :param event: The QResizeEvent instance containing event-related data.
+        :type event: QResizeEvent
+        :return: None
+        """
+        super().resizeEvent(event)
+        self._centers = None
+
     def _find_closest_button(self, position):
         """
         Finds the closest button to a given position horizontally and returns it along with its index.
 
-        This method calculates the horizontal distance between the given position
-        and the center of each button. It identifies the button with the minimum
-        distance and returns it alongside its index.
+        The button centers are monotonic in x, so this method binary-searches the
+        cached list of centers and only compares the two neighboring candidates,
+        instead of measuring the distance to every button.
 
         :param position: The position against which the closest button is calculated.
                          It is expected to have an `x()` method for retrieving the x-coordinate.
@@ -240,18 +284,15 @@ class CustomHeader(QWidget):
         :return: A tuple containing the closest button object and its index in the buttons list.
         :rtype: tuple
         """
-        closest_button = None
-        min_distance = float("inf")
-        index = -1
-
-        for i, button in enumerate(self.buttons):
-            distance = abs(button.geometry().center().x() - position.x())
-            if distance < min_distance:
-                min_distance = distance
-                closest_button = button
-                index = i
+        centers = self._button_centers()
+        if not centers:
+            return None, -1
 
-        return closest_button, index
+        x = position.x()
+        right = bisect_left(centers, x)
+        candidates = [i for i in (right - 1, right) if 0 <= i < len(centers)]
+        index = min(candidates, key=lambda i: abs(centers[i] - x))
+        return self.buttons[index], index
 
     def _should_insert_after(self, button, position):
         """
@@ -271,21 +312,6 @@ class CustomHeader(QWidget):
         """
         return position.x() > button.geometry().left() + button.geometry().width() / 2
 
-    def _update_button_list(self):
-        """
-        Updates the list of buttons by iterating through the items in the layout, checking
-        if each item is a widget of type DraggableButton, and storing matching widgets
-        in the 'buttons' attribute.
-
-        :raises AttributeError: If 'layout' or 'itemAt' is not properly defined on the class,
-            an AttributeError may be raised during execution.
-        """
-        self.buttons = [
-            widget
-            for i in range(self.layout.count())
-            if isinstance((widget := self.layout.itemAt(i).widget()), DraggableButton)
-        ]
-
 
 class CustomTreeWidget(QTreeWidget):
     """
@@ -312,10 +338,12 @@ class CustomTreeWidget(QTreeWidget):
     :type prop_label: str or None
     :ivar default_labels: Default labels for the tree widget columns.
     :type default_labels: List[str] or None
-    :ivar checked_uids: List of UIDs whose items are currently checked within the tree structure.
-    :type checked_uids: List[Any]
+    :ivar checked_uids: Set of UIDs whose items are currently checked within the tree structure.
+    :type checked_uids: Set[Any]
     :ivar combo_values: Dictionary mapping UIDs to their corresponding property combo box values.
     :type combo_values: Dict[Any, str]
+    :ivar _uid_to_item: Dictionary mapping UIDs to their tree items for O(1) lookups.
+    :type _uid_to_item: Dict[Any, QTreeWidgetItem]
     :ivar header_labels: List of column headers displayed at the top of the tree widget.
     :type header_labels: List[str]
     :ivar header_widget: A custom header widget used to enable additional functionality like toggling and hierarchy rearrangement.
@@ -331,6 +359,7 @@ class CustomTreeWidget(QTreeWidget):
         uid_label=None,
         prop_label=None,
         default_labels=None,
+        lazy_population=False,
     ):
         """
         Initializes an advanced QTreeWidget subclass and configures its settings
@@ -353,6 +382,11 @@ class CustomTreeWidget(QTreeWidget):
         :type prop_label: str, optional
         :param default_labels: Initial list of default labels to be used if required.
         :type default_labels: list of str, optional
+        :param lazy_population: When True, only the first hierarchy level is built
+            up front and deeper levels are materialized on expansion. Useful for
+            very large collections; the tree is not expanded by default in this
+            mode.
+        :type lazy_population: bool, optional
 
         :raises ValueError: Raised internally if incorrect arguments or unexpected
             parameters are passed during instantiation. Does not describe specific
@@ -361,6 +395,9 @@ class CustomTreeWidget(QTreeWidget):
 
         """
         super().__init__()
+        # All rows have the same height (text plus a fixed-height combo), so
+        # let Qt cache a single row height instead of measuring every item
+        self.setUniformRowHeights(True)
         self.parent = parent
         self.collection_df = collection_df
         self.tree_labels = tree_labels
@@ -368,8 +405,15 @@ class CustomTreeWidget(QTreeWidget):
         self.prop_label = prop_label
         self.default_labels = default_labels
         self.uid_label = uid_label
-        self.checked_uids = []
+        self.lazy_population = lazy_population
+        self.checked_uids = set()
         self.combo_values = {}
+        self._uid_to_item = {}
+        self._last_check_state = {}
+        self._children_index = {}
+        self._actors_row_cache = None
+        self._collection_row_cache = None
+        self._in_check_update = False
         self.header_labels = ["Tree", name_label]
         self.blockSignals(False)
         self.setColumnCount(3)
@@ -381,35 +425,45 @@ class CustomTreeWidget(QTreeWidget):
 
         # Import initial property states from actors_df
         if self.parent and hasattr(self.parent, "actors_df"):
-            for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-                uid = self.get_item_uid(item)
-                if uid:
-                    combo = self.itemWidget(item, self.columnCount() - 1)
-                    if combo:
-                        # Get the show_property value for this uid from actors_df
-                        property_value = self.parent.actors_df.loc[
-                            self.parent.actors_df["uid"] == uid, "show_property"
-                        ].iloc[0]
-                        # Find and set the index in the combo box
-                        index = combo.findText(property_value)
-                        if index >= 0:
-                            combo.setCurrentIndex(index)
-                            # Update the stored combo value
-                            self.combo_values[uid] = property_value
+            last_col = self.columnCount() - 1
+            show_property_col = self.parent.actors_df.columns.get_loc("show_property")
+            for uid, item in self._uid_to_item.items():
+                combo = self.itemWidget(item, last_col)
+                if combo:
+                    # Get the show_property value for this uid from actors_df
+                    row_pos = self._actors_row_position(uid)
+                    if row_pos is None:
+                        continue
+                    property_value = self.parent.actors_df.iat[
+                        row_pos, show_property_col
+                    ]
+                    # Find and set the index in the combo box
+                    index = combo.findText(property_value)
+                    if index >= 0:
+                        combo.setCurrentIndex(index)
+                        # Update the stored combo value
+                        self.combo_values[uid] = property_value
 
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.toggle_with_menu)
         self.header().hide()
-        self.itemExpanded.connect(self.resize_columns)
-        self.itemCollapsed.connect(self.resize_columns)
-        self.itemChanged.connect(
-            lambda item, column: (
-                self.on_checkbox_changed(item, column)
-                if item.childCount() == 0
-                else None
-            )
-        )
-        self.itemSelectionChanged.connect(self.emit_selection_changed)
+        # Coalesce resize_columns bursts (e.g. expand/collapse storms) into a
+        # single deferred resize
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self.resize_columns)
+        self.itemExpanded.connect(self._lazy_expand)
+        self.itemExpanded.connect(self._schedule_resize_columns)
+        self.itemCollapsed.connect(self._schedule_resize_columns)
+        self.itemChanged.connect(self.on_checkbox_changed)
+        # Coalesce selection-changed bursts (e.g. rubber-band or shift-click
+        # sweeps) into a single deferred emit_selection_changed call
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(0)
+        self._selection_timer.timeout.connect(self.emit_selection_changed)
+        self.itemSelectionChanged.connect(self._selection_timer.start)
         # Import initial selection state if parent and collection exist
         if (
             self.parent
@@ -462,10 +516,10 @@ class CustomTreeWidget(QTreeWidget):
         # Clear current selection
         self.clearSelection()
 
-        # Find all items matching our UIDs and select them
-        for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-            uid = self.get_item_uid(item)
-            if uid and uid in uids_to_select:
+        # Look up the items matching our UIDs and select them
+        for uid in uids_to_select:
+            item = self._uid_to_item.get(uid)
+            if item:
                 item.setSelected(True)
 
         # Restore our selection list
@@ -487,84 +541,382 @@ class CustomTreeWidget(QTreeWidget):
         :param self: The instance of the class containing the method.
         :return: None
         """
-        # Save current combo values before clearing the tree
-        if self.invisibleRootItem().childCount() > 0:
-            for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-                uid = self.get_item_uid(item)
-                if uid:
-                    combo = self.itemWidget(item, self.columnCount() - 1)
-                    if combo:
-                        self.combo_values[uid] = combo.currentText()
+        # Save current combo values before clearing the tree in one
+        # dict-comprehension pass over the uid map
+        last_col = self.columnCount() - 1
+        self.combo_values.update(
+            {
+                uid: combo.currentText()
+                for uid, item in self._uid_to_item.items()
+                if (combo := self.itemWidget(item, last_col)) is not None
+            }
+        )
+
+        # Suspend painting, sorting and signal emission while the tree is
+        # rebuilt, so Qt does not recompute geometry, re-sort or dispatch
+        # slots on every addChild
+        was_sorted = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        self.setUpdatesEnabled(False)
+        signals_were_blocked = self.signalsBlocked()
+        self.blockSignals(True)
+        try:
+            self._do_populate_tree()
+        finally:
+            self.blockSignals(signals_were_blocked)
+            self.setUpdatesEnabled(True)
+            self.setSortingEnabled(was_sorted)
+
+        # Resize columns once, with updates re-enabled
+        self.resize_columns()
+
+    def _do_populate_tree(self):
+        """
+        Performs the actual tree rebuild for :meth:`populate_tree`. Expects the
+        caller to have disabled updates and blocked signals beforehand.
 
+        :return: None
+        """
         # Clean up existing widgets before clearing the tree
         self._cleanup_tree_widgets()
         self.clear()
+        self._uid_to_item = {}
+        self._last_check_state = {}
+        self._children_index = {}
         hierarchy = self.header_widget.get_order()
 
         # Ensure actors_df 'show' column is string type before we start
         if hasattr(self.parent, "actors_df"):
             self.parent.actors_df["show"] = self.parent.actors_df["show"].astype(str)
 
-        for _, row in self.collection_df.iterrows():
-            parent = self.invisibleRootItem()
-            for level in hierarchy:
-                parent = self.get_or_create_item(parent, row[level])
+        # In lazy mode only the first hierarchy level is materialized up front;
+        # deeper levels are built on demand by _lazy_expand
+        if self.lazy_population and hierarchy:
+            self._populate_first_level(hierarchy)
+            return
 
-            # Create item with empty first column and name in the second column
-            name_item = QTreeWidgetItem(["", row[self.name_label]])
+        root = self.invisibleRootItem()
+        if hierarchy:
+            # Group rows by the full hierarchy in one pandas pass and cache the
+            # parent chain per key prefix, so each hierarchy item is looked up
+            # or created exactly once instead of once per row
+            path_items = {}
+            # Group on categorical keys so pandas hashes small integer codes
+            # instead of the repeated strings in the hierarchy columns
+            keys = [self.collection_df[level].astype("category") for level in hierarchy]
+            grouped = self.collection_df.groupby(
+                keys, sort=False, dropna=False, observed=True
+            )
+            for key, sub in grouped:
+                if not isinstance(key, tuple):
+                    key = (key,)
+                parent = root
+                for depth in range(1, len(key) + 1):
+                    prefix = key[:depth]
+                    item = path_items.get(prefix)
+                    if item is None:
+                        item = self.get_or_create_item(parent, key[depth - 1])
+                        path_items[prefix] = item
+                    parent = item
+                self._add_leaf_items(parent, sub)
+        else:
+            self._add_leaf_items(root, self.collection_df)
 
-            # Store the UID and set initial checkbox state
-            if self.uid_label and self.uid_label in row:
-                uid = str(row[self.uid_label])
-                name_item.setData(0, Qt.UserRole, uid)
-                name_item.setFlags(name_item.flags() | Qt.ItemIsUserCheckable)
+        # Expand all items with a single recursive call while updates are off
+        self.expandAll()
 
-                # Force initial state to unchecked
-                name_item.setCheckState(0, Qt.Unchecked)
+        # Update parent checkbox states based on the imported states
+        self.update_all_parent_check_states()
 
-                if hasattr(self.parent, "actors_df"):
-                    mask = self.parent.actors_df["uid"] == uid
-                    if any(mask):
-                        show_state = str(
-                            self.parent.actors_df.loc[mask, "show"].iloc[0]
-                        )
+    def _build_leaf_item(self, row):
+        """
+        Builds a leaf item for one row of collection_df without inserting it
+        into the tree, configuring its UID and checkbox state from actors_df.
+        The caller is responsible for adding the item to a parent and attaching
+        its combo box afterwards.
 
-                        # Ensure we're working with string values
-                        is_checked = show_state.lower() == "true"
-                        checkbox_state = Qt.Checked if is_checked else Qt.Unchecked
-                        if is_checked:
-                            self.checked_uids.append(uid)
-                        name_item.setCheckState(0, checkbox_state)
-            else:
-                name_item.setFlags(name_item.flags() | Qt.ItemIsUserCheckable)
-                name_item.setCheckState(0, Qt.Unchecked)
+        :param row: The collection_df row providing name and uid.
+        :type row: dict or pandas.Series
+        :return: The newly built leaf item.
+        :rtype: QTreeWidgetItem
+        """
+        # Create item with empty first column and name in the second column
+        name_item = QTreeWidgetItem(["", row[self.name_label]])
 
-            parent.addChild(name_item)
+        # Store the UID and set initial checkbox state
+        if self.uid_label and self.uid_label in row:
+            uid = str(row[self.uid_label])
+            name_item.uid = uid
+            self._uid_to_item[uid] = name_item
+            name_item.setFlags(name_item.flags() | Qt.ItemIsUserCheckable)
 
-            # Create and set up the QComboBox
-            property_combo = QComboBox()
-            for label in self.default_labels:
-                property_combo.addItem(label)
-            property_combo.addItems(row[self.prop_label])
+            # Force initial state to unchecked
+            name_item.setCheckState(0, Qt.Unchecked)
 
-            # Restore the previously selected value if it exists
-            if uid in self.combo_values:
-                index = property_combo.findText(self.combo_values[uid])
-                if index >= 0:
-                    property_combo.setCurrentIndex(index)
-            property_combo.currentTextChanged.connect(
-                lambda text, item=name_item: self.on_combo_changed(item, text)
+            if hasattr(self.parent, "actors_df"):
+                row_pos = self._actors_row_position(uid)
+                if row_pos is not None:
+                    show_col = self.parent.actors_df.columns.get_loc("show")
+                    show_state = str(self.parent.actors_df.iat[row_pos, show_col])
+
+                    # Ensure we're working with string values
+                    is_checked = show_state.lower() == "true"
+                    checkbox_state = Qt.Checked if is_checked else Qt.Unchecked
+                    if is_checked:
+                        self.checked_uids.add(uid)
+                    name_item.setCheckState(0, checkbox_state)
+            self._last_check_state[uid] = name_item.checkState(0)
+        else:
+            name_item.setFlags(name_item.flags() | Qt.ItemIsUserCheckable)
+            name_item.setCheckState(0, Qt.Unchecked)
+
+        return name_item
+
+    def _attach_leaf_combo(self, name_item, row):
+        """
+        Creates the property combo box for an already inserted leaf item and
+        sets it in the last column, restoring any previously selected value.
+
+        :param name_item: The leaf item that will own the combo box.
+        :type name_item: QTreeWidgetItem
+        :param row: The collection_df row providing the available properties.
+        :type row: dict or pandas.Series
+        :return: None
+        """
+        property_combo = QComboBox()
+        for label in self.default_labels:
+            property_combo.addItem(label)
+        property_combo.addItems(row[self.prop_label])
+
+        # Freeze the combo height so rows really are uniform
+        property_combo.setFixedHeight(property_combo.sizeHint().height())
+
+        # Restore the previously selected value if it exists
+        uid = self.get_item_uid(name_item)
+        if uid in self.combo_values:
+            index = property_combo.findText(self.combo_values[uid])
+            if index >= 0:
+                property_combo.setCurrentIndex(index)
+        property_combo.currentTextChanged.connect(
+            partial(self.on_combo_changed, name_item)
+        )
+
+        self.setItemWidget(name_item, self.columnCount() - 1, property_combo)
+
+    def _create_leaf_item(self, parent, row):
+        """
+        Creates a leaf item for one row of collection_df under the given parent,
+        configuring its checkbox state from actors_df and attaching the property
+        combo box in the last column.
+
+        :param parent: The hierarchy item that will own the new leaf.
+        :type parent: QTreeWidgetItem
+        :param row: The collection_df row providing name, uid and properties.
+        :type row: dict or pandas.Series
+        :return: The newly created leaf item.
+        :rtype: QTreeWidgetItem
+        """
+        name_item = self._build_leaf_item(row)
+        parent.addChild(name_item)
+        self._attach_leaf_combo(name_item, row)
+        return name_item
+
+    def _add_leaf_items(self, parent, rows_df):
+        """
+        Builds one leaf item per row of the given collection_df slice and
+        inserts them under the parent with a single addChildren call, so Qt
+        emits one batched model change instead of one per row. Combo boxes are
+        attached after insertion since setItemWidget requires in-tree items.
+
+        :param parent: The hierarchy item that will own the new leaves.
+        :type parent: QTreeWidgetItem
+        :param rows_df: The collection_df slice providing the rows to insert.
+        :type rows_df: pandas.DataFrame
+        :return: None
+        """
+        # itertuples avoids the per-row Series allocation of iterrows; zip the
+        # values back with the column labels so lookups stay label-based
+        columns = list(rows_df.columns)
+        leaf_rows = [
+            (self._build_leaf_item(row), row)
+            for row in (
+                dict(zip(columns, values))
+                for values in rows_df.itertuples(index=False, name=None)
             )
+        ]
+        parent.addChildren([name_item for name_item, _ in leaf_rows])
+        for name_item, row in leaf_rows:
+            self._attach_leaf_combo(name_item, row)
 
-            # Add the item and set the combo box in the last column
-            self.setItemWidget(name_item, self.columnCount() - 1, property_combo)
+    def _populate_first_level(self, hierarchy):
+        """
+        Builds only the first hierarchy level of the tree, attaching a lazy
+        placeholder child to each group so the subtree is materialized the
+        first time the group is expanded.
 
-        # Expand all items and resize columns
-        self.expandAll()
-        self.resize_columns()
+        :param hierarchy: Ordered list of hierarchy levels from the header.
+        :type hierarchy: list[str]
+        :return: None
+        """
+        grouped = self.collection_df.groupby(
+            hierarchy[0], sort=False, dropna=False, observed=True
+        )
+        for value, group_df in grouped:
+            item = self.get_or_create_item(self.invisibleRootItem(), value)
+            self._attach_lazy_placeholder(item, group_df, hierarchy[1:])
 
-        # Update parent checkbox states based on the imported states
+    def _attach_lazy_placeholder(self, item, group_df, remaining_levels):
+        """
+        Attaches a dummy child carrying the pending collection_df slice and the
+        hierarchy levels still to be built, marking the item for lazy expansion.
+
+        :param item: The hierarchy item whose subtree is deferred.
+        :type item: QTreeWidgetItem
+        :param group_df: The collection_df slice belonging to this subtree.
+        :type group_df: pandas.DataFrame
+        :param remaining_levels: Hierarchy levels below this item, outermost first.
+        :type remaining_levels: list[str]
+        :return: None
+        """
+        placeholder = QTreeWidgetItem(["..."])
+        placeholder.setData(0, Qt.UserRole + 1, (group_df, remaining_levels))
+        item.addChild(placeholder)
+
+    def _lazy_expand(self, item):
+        """
+        Materializes the next level of a lazily populated subtree the first time
+        its item is expanded. Items without a pending placeholder are ignored, so
+        this slot is safe to keep connected for eagerly built trees as well.
+
+        :param item: The item that was just expanded.
+        :type item: QTreeWidgetItem
+        :return: None
+        """
+        if item.childCount() != 1:
+            return
+        placeholder = item.child(0)
+        payload = placeholder.data(0, Qt.UserRole + 1)
+        if payload is None:
+            return
+        # A check-state change made while this group was still pending is
+        # stashed on the placeholder by update_child_check_states
+        pending_state = getattr(placeholder, "pending_state", None)
+        item.removeChild(placeholder)
+        group_df, remaining_levels = payload
+
+        self.setUpdatesEnabled(False)
+        signals_were_blocked = self.signalsBlocked()
+        self.blockSignals(True)
+        try:
+            if remaining_levels:
+                grouped = group_df.groupby(
+                    remaining_levels[0], sort=False, dropna=False, observed=True
+                )
+                for value, sub_df in grouped:
+                    child = self.get_or_create_item(item, value)
+                    self._attach_lazy_placeholder(child, sub_df, remaining_levels[1:])
+            else:
+                self._add_leaf_items(item, group_df)
+            if pending_state is not None:
+                # Apply the state set on the pending group to the children it
+                # just materialized (deeper placeholders inherit the stash)
+                self.update_child_check_states(item, pending_state)
+        finally:
+            self.blockSignals(signals_were_blocked)
+            self.setUpdatesEnabled(True)
+        if pending_state is not None:
+            # Sync actors_df and notify listeners about the leaves that only
+            # now received the stashed state
+            self.emit_checkbox_toggled()
+        self._schedule_resize_columns()
+
+    def _regroup_leaf_items(self):
+        """
+        Rebuilds only the grouping spine for the current header order,
+        re-parenting the existing leaf items instead of destroying and
+        recreating them, so UIDs and check states survive without a restore
+        pass. The combo boxes are recreated from the saved combo values because
+        the view deletes item widgets when their rows are removed; the leaf
+        items themselves are reused. Falls back to a full repopulate when
+        leaves cannot be identified by UID or the tree is lazily populated.
+
+        :return: None
+        """
+        if not self.uid_label or self.lazy_population or not self._uid_to_item:
+            self.populate_tree()
+            return
+
+        # Save combo selections before the view deletes the widgets
+        last_col = self.columnCount() - 1
+        self.combo_values.update(
+            {
+                uid: combo.currentText()
+                for uid, item in self._uid_to_item.items()
+                if (combo := self.itemWidget(item, last_col)) is not None
+            }
+        )
+
+        # Detach all leaves; their uid data and check states stay intact. The
+        # combos are silenced and disconnected first since detaching a row
+        # schedules deletion of its widget
+        for item in self._uid_to_item.values():
+            combo = self.itemWidget(item, last_col)
+            if combo:
+                combo.blockSignals(True)
+                try:
+                    combo.currentTextChanged.disconnect()
+                except (RuntimeError, TypeError):
+                    pass
+            parent = item.parent()
+            if parent:
+                parent.removeChild(item)
+            else:
+                self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+
+        # Drop the now-empty grouping spine
+        self.clear()
+        self._children_index = {}
+
+        # Rebuild the spine for the new hierarchy and re-attach the leaves
+        hierarchy = self.header_widget.get_order()
+        root = self.invisibleRootItem()
+        path_items = {}
+        if hierarchy:
+            # Categorical keys: group on integer codes rather than strings
+            keys = [self.collection_df[level].astype("category") for level in hierarchy]
+            grouped = self.collection_df.groupby(
+                keys, sort=False, dropna=False, observed=True
+            )
+        else:
+            grouped = [((), self.collection_df)]
+        for key, sub in grouped:
+            if not isinstance(key, tuple):
+                key = (key,)
+            parent = root
+            for depth in range(1, len(key) + 1):
+                prefix = key[:depth]
+                item = path_items.get(prefix)
+                if item is None:
+                    item = self.get_or_create_item(parent, key[depth - 1])
+                    path_items[prefix] = item
+                parent = item
+
+            leaf_rows = []
+            columns = list(sub.columns)
+            for values in sub.itertuples(index=False, name=None):
+                row = dict(zip(columns, values))
+                uid = str(row[self.uid_label])
+                item = self._uid_to_item.get(uid)
+                if item is None:
+                    item = self._build_leaf_item(row)
+                leaf_rows.append((item, row))
+            parent.addChildren([item for item, _ in leaf_rows])
+            for item, row in leaf_rows:
+                self._attach_leaf_combo(item, row)
+
+        self.expandAll()
         self.update_all_parent_check_states()
+        self._schedule_resize_columns()
 
     @preserve_selection
     def rearrange_hierarchy(self):
@@ -578,30 +930,24 @@ class CustomTreeWidget(QTreeWidget):
         """
         # Store the current selection and checkbox states before repopulating
         saved_selected = self.parent.collection.selected_uids.copy()
+        # checked_uids is maintained on every toggle, so no tree scan is
+        # needed to harvest the checked population
         saved_checked = self.checked_uids.copy()
 
-        # Save any additional checkboxes that might not be in self.checked_uids yet
-        if self.invisibleRootItem().childCount() > 0:
-            for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-                uid = self.get_item_uid(item)
-                if (
-                    uid
-                    and item.checkState(0) == Qt.Checked
-                    and uid not in saved_checked
-                ):
-                    saved_checked.append(uid)
-
-        # Block signals temporarily to prevent unnecessary signal emissions during rebuild
+        # Block signals and painting temporarily to prevent unnecessary signal
+        # emissions and repaints during rebuild
+        self.setUpdatesEnabled(False)
         self.blockSignals(True)
 
-        # Repopulate the tree (this will clear selections and checkboxes)
-        self.populate_tree()
+        # Regroup the existing leaf items under the new hierarchy (this will
+        # clear selections)
+        self._regroup_leaf_items()
 
         # Restore checkbox states
-        self.checked_uids = saved_checked  # Restore the checked_uids list directly
-        for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-            uid = self.get_item_uid(item)
-            if uid and uid in saved_checked:
+        self.checked_uids = saved_checked  # Restore the checked set directly
+        for uid in saved_checked:
+            item = self._uid_to_item.get(uid)
+            if item:
                 item.setCheckState(0, Qt.Checked)
 
         # Update parent checkbox states based on children
@@ -610,17 +956,18 @@ class CustomTreeWidget(QTreeWidget):
         # Restore selection
         self.clearSelection()  # Ensure a clean state before restoring
         if saved_selected:
-            # Find all items matching our saved UIDs and select them
-            for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-                uid = self.get_item_uid(item)
-                if uid and uid in saved_selected:
+            # Look up the items matching our saved UIDs and select them
+            for uid in saved_selected:
+                item = self._uid_to_item.get(uid)
+                if item:
                     item.setSelected(True)
 
         # Restore our saved selection list directly
         self.parent.collection.selected_uids = saved_selected
 
-        # Unblock signals
+        # Unblock signals and re-enable painting
         self.blockSignals(False)
+        self.setUpdatesEnabled(True)
 
         # Emit selection signal to notify any listeners of the restored selection
         if saved_selected:
@@ -661,9 +1008,10 @@ class CustomTreeWidget(QTreeWidget):
 
         for uid in uids_to_add:
             # Get the row from collection_df for this UID
-            row = self.collection_df.loc[
-                self.collection_df[self.uid_label] == uid
-            ].iloc[0]
+            row_pos = self._collection_row_position(uid)
+            if row_pos is None:
+                continue
+            row = self.collection_df.iloc[row_pos]
 
             # Find or create the path in the tree hierarchy
             parent = self.invisibleRootItem()
@@ -675,9 +1023,7 @@ class CustomTreeWidget(QTreeWidget):
                 parent = self.get_or_create_item(parent, row[level])
                 parents_to_expand.append(parent)
                 if not (parent.flags() & Qt.ItemIsUserCheckable):
-                    parent.setFlags(
-                        parent.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsAutoTristate
-                    )
+                    parent.setFlags(parent.flags() | Qt.ItemIsUserCheckable)
                     parent.setCheckState(0, Qt.Unchecked)
 
             # Create item with empty first column and name in second column
@@ -686,7 +1032,8 @@ class CustomTreeWidget(QTreeWidget):
             name_item.setCheckState(0, Qt.Unchecked)  # Set initial state
 
             # Set the UID and checkbox state
-            name_item.setData(0, Qt.UserRole, uid)
+            name_item.uid = uid
+            self._uid_to_item[uid] = name_item
 
             # Set initial checkbox state based on actors_df if available
             if hasattr(self.parent, "actors_df"):
@@ -696,7 +1043,7 @@ class CustomTreeWidget(QTreeWidget):
                     is_checked = show_state.lower() == "true"
                     checkbox_state = Qt.Checked if is_checked else Qt.Unchecked
                     if is_checked:
-                        self.checked_uids.append(uid)
+                        self.checked_uids.add(uid)
                     name_item.setCheckState(0, checkbox_state)
 
             parent.addChild(name_item)
@@ -714,7 +1061,7 @@ class CustomTreeWidget(QTreeWidget):
                     property_combo.setCurrentIndex(index)
 
             property_combo.currentTextChanged.connect(
-                lambda text, item=name_item: self.on_combo_changed(item, text)
+                partial(self.on_combo_changed, name_item)
             )
 
             self.setItemWidget(name_item, self.columnCount() - 1, property_combo)
@@ -728,6 +1075,25 @@ class CustomTreeWidget(QTreeWidget):
         self.resize_columns()
         return True
 
+    def add_items_batch(self, new_df):
+        """
+        Appends the rows of a DataFrame to collection_df and inserts the
+        corresponding tree items in a single call, so callers no longer have
+        to concatenate the frame themselves before calling
+        :meth:`add_items_to_tree` with a uid list.
+
+        :param new_df: The rows to add; must use the same columns as
+                       `collection_df`.
+        :type new_df: pandas.DataFrame
+        :return: Boolean indicating whether the items were added individually
+                 (True) or if the tree was rebuilt entirely (False).
+        :rtype: bool
+        """
+        if new_df is None or new_df.empty:
+            return True
+        self.collection_df = pd.concat([self.collection_df, new_df], ignore_index=True)
+        return self.add_items_to_tree([str(uid) for uid in new_df[self.uid_label]])
+
     @preserve_selection
     def remove_items_from_tree(self, uids_to_remove):
         """
@@ -756,24 +1122,20 @@ class CustomTreeWidget(QTreeWidget):
             return False
 
         # Remove items one by one
+        last_col = self.columnCount() - 1
         for uid in uids_to_remove:
-            # Find all items matching our UID
-            items_to_remove = []
-            for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-                if self.get_item_uid(item) == uid:
-                    items_to_remove.append(item)
-
-            # Remove found items
-            for item in items_to_remove:
+            # Look up the item matching our UID
+            item = self._uid_to_item.pop(uid, None)
+            self._last_check_state.pop(uid, None)
+            if item:
                 # Clean up any associated widgets (like combo boxes)
-                combo = self.itemWidget(item, self.columnCount() - 1)
+                combo = self.itemWidget(item, last_col)
                 if combo:
                     combo.deleteLater()
-                    self.removeItemWidget(item, self.columnCount() - 1)
+                    self.removeItemWidget(item, last_col)
 
                 # Remove the item from checked_uids if present
-                if uid in self.checked_uids:
-                    self.checked_uids.remove(uid)
+                self.checked_uids.discard(uid)
 
                 # Remove the item from combo_values if present
                 if uid in self.combo_values:
@@ -813,13 +1175,23 @@ class CustomTreeWidget(QTreeWidget):
         :return: The existing or newly created child item.
         :rtype: QTreeWidgetItem
         """
-        for i in range(parent.childCount()):
-            if parent.child(i).text(0) == text:
-                return parent.child(i)
-        item = QTreeWidgetItem([text])
-        item.setFlags(item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsAutoTristate)
-        item.setCheckState(0, Qt.Unchecked)
-        parent.addChild(item)
+        # Index the parent's children by text once, then resolve lookups with
+        # a dict hit instead of a linear scan per insertion
+        bucket = self._children_index.get(id(parent))
+        if bucket is None:
+            bucket = {
+                parent.child(i).text(0): parent.child(i)
+                for i in range(parent.childCount())
+            }
+            self._children_index[id(parent)] = bucket
+
+        item = bucket.get(text)
+        if item is None:
+            item = QTreeWidgetItem([text])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.Unchecked)
+            parent.addChild(item)
+            bucket[text] = item
         return item
 
     def set_selection_from_uids(self, uids):
@@ -840,9 +1212,9 @@ class CustomTreeWidget(QTreeWidget):
         self.clearSelection()
 
         # Find and select items with matching UIDs
-        for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-            uid = self.get_item_uid(item)
-            if uid in uids:
+        for uid in uids:
+            item = self._uid_to_item.get(uid)
+            if item:
                 item.setSelected(True)
 
         # Unblock signals
@@ -894,10 +1266,29 @@ class CustomTreeWidget(QTreeWidget):
         :type check_state: Qt.CheckState
         :return: None
         """
-        for i in range(item.childCount()):
-            child = item.child(i)
-            child.setCheckState(0, check_state)
-            self.update_child_check_states(child, check_state)
+        # Walk the subtree with an explicit stack: no Python frame per node
+        # and no recursion limit on deep trees
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            for i in range(current.childCount()):
+                child = current.child(i)
+                if child.data(0, Qt.UserRole + 1) is not None:
+                    # Lazy placeholder: stash the state so _lazy_expand can
+                    # apply it to the leaves it materializes later
+                    child.pending_state = check_state
+                    continue
+                child.setCheckState(0, check_state)
+                # Keep the last-known-state cache and the checked set in sync
+                # even though signals are blocked during this walk
+                uid = self.get_item_uid(child)
+                if uid:
+                    self._last_check_state[uid] = check_state
+                    if check_state == Qt.Checked:
+                        self.checked_uids.add(uid)
+                    else:
+                        self.checked_uids.discard(uid)
+                stack.append(child)
 
     def update_parent_check_states(self, item):
         """
@@ -909,35 +1300,83 @@ class CustomTreeWidget(QTreeWidget):
         :type item: QTreeWidgetItem
         :return: None
         """
+        # Climb the ancestor chain iteratively, counting child states in a
+        # single pass per level; a mixed population can stop counting early
         parent = item.parent()
-        if parent:
-            children = [parent.child(i) for i in range(parent.childCount())]
-            check_states = [child.checkState(0) for child in children]
-
-            if all(state == Qt.Checked for state in check_states):
-                parent.setCheckState(0, Qt.Checked)
-            elif all(state == Qt.Unchecked for state in check_states):
-                parent.setCheckState(0, Qt.Unchecked)
+        while parent:
+            child_count = parent.childCount()
+            checked = unchecked = 0
+            for i in range(child_count):
+                state = parent.child(i).checkState(0)
+                if state == Qt.Checked:
+                    checked += 1
+                elif state == Qt.Unchecked:
+                    unchecked += 1
+                else:
+                    break
+                if checked and unchecked:
+                    break
+
+            if checked == child_count:
+                new_state = Qt.Checked
+            elif unchecked == child_count:
+                new_state = Qt.Unchecked
             else:
-                parent.setCheckState(0, Qt.PartiallyChecked)
+                new_state = Qt.PartiallyChecked
 
-            self.update_parent_check_states(parent)
+            # If this ancestor keeps its state, the ones above it do too
+            if parent.checkState(0) == new_state:
+                break
+            parent.setCheckState(0, new_state)
+            parent = parent.parent()
 
     def update_all_parent_check_states(self):
         """
         Updates the check states of all parent items in the tree.
 
-        This method traverses through all the items in the tree in reverse order,
-        updating the check states of their respective parent items based on the
-        check states of their children. It ensures consistency in check states
+        This method performs a single post-order sweep over the tree, so every
+        parent is visited after its children and its check state is computed
+        exactly once from theirs. It ensures consistency in check states
         throughout the tree hierarchy.
 
         :return: None
         """
-        all_items = self.findItems("", Qt.MatchContains | Qt.MatchRecursive)
-        for item in reversed(all_items):
-            if item.parent():
-                self.update_parent_check_states(item)
+        # Silence itemChanged while parents are rewritten; callers emit the
+        # aggregate result themselves
+        signals_were_blocked = self.signalsBlocked()
+        self.blockSignals(True)
+        try:
+            self._sweep_parent_check_states()
+        finally:
+            self.blockSignals(signals_were_blocked)
+
+    def _sweep_parent_check_states(self):
+        """
+        Post-order sweep that recomputes every parent's check state from its
+        children. Must run with tree signals blocked.
+
+        :return: None
+        """
+        root = self.invisibleRootItem()
+        stack = [(root.child(i), False) for i in range(root.childCount())]
+        while stack:
+            item, children_done = stack.pop()
+            child_count = item.childCount()
+            if child_count == 0:
+                continue
+            if not children_done:
+                # Revisit this parent once all of its children are resolved
+                stack.append((item, True))
+                for i in range(child_count):
+                    stack.append((item.child(i), False))
+            else:
+                check_states = [item.child(i).checkState(0) for i in range(child_count)]
+                if all(state == Qt.Checked for state in check_states):
+                    item.setCheckState(0, Qt.Checked)
+                elif all(state == Qt.Unchecked for state in check_states):
+                    item.setCheckState(0, Qt.Unchecked)
+                else:
+                    item.setCheckState(0, Qt.PartiallyChecked)
 
     def emit_checkbox_toggled(self):
         """
@@ -962,26 +1401,18 @@ class CustomTreeWidget(QTreeWidget):
         :rtype: None
         :return: None
         """
-        # Update the checked state in actors_df based on the current tree state
-        turn_on_uids = []
-        turn_off_uids = []
-        for item in self.findItems(
-            "", Qt.MatchContains | Qt.MatchRecursive, 1
-        ):  # Search in the name column (1)
-            uid = self.get_item_uid(item)
-            if uid:
-                is_checked = item.checkState(0) == Qt.Checked
-                is_shown = self.parent.actors_df.loc[
-                    self.parent.actors_df["uid"] == uid, "show"
-                ].iloc[0]
-                if is_checked != is_shown:
-                    self.parent.actors_df.loc[
-                        self.parent.actors_df["uid"] == uid, "show"
-                    ] = is_checked
-                    if is_checked:
-                        turn_on_uids.append(uid)
-                    else:
-                        turn_off_uids.append(uid)
+        # Collect the checked state of every item, then update actors_df in a
+        # single vectorized pass instead of one masked lookup per uid
+        states = {
+            uid: item.checkState(0) == Qt.Checked
+            for uid, item in self._uid_to_item.items()
+        }
+        actors_df = self.parent.actors_df
+        new_show = actors_df["uid"].map(states)
+        changed = new_show.notna() & (new_show != actors_df["show"])
+        turn_on_uids = actors_df.loc[changed & new_show.eq(True), "uid"].tolist()
+        turn_off_uids = actors_df.loc[changed & new_show.eq(False), "uid"].tolist()
+        actors_df.loc[changed, "show"] = new_show[changed]
         # Emit signal
         self.parent.signals.checkboxToggled.emit(
             self.parent.collection.name, turn_on_uids, turn_off_uids
@@ -994,10 +1425,32 @@ class CustomTreeWidget(QTreeWidget):
         if column != 0 or item.checkState(0) == Qt.PartiallyChecked:
             return
 
+        # Re-entrancy guard: the propagation below rewrites check states,
+        # which must not trigger a nested handler run
+        if self._in_check_update:
+            return
+
+        # Ignore itemChanged emissions that did not actually flip the checkbox
+        # (e.g. edits to other roles or redundant programmatic sets)
+        uid = self.get_item_uid(item)
+        if uid:
+            new_state = item.checkState(0)
+            if self._last_check_state.get(uid) == new_state:
+                return
+            self._last_check_state[uid] = new_state
+            if new_state == Qt.Checked:
+                self.checked_uids.add(uid)
+            else:
+                self.checked_uids.discard(uid)
+
+        self._in_check_update = True
         self.blockSignals(True)
-        self.update_child_check_states(item, item.checkState(0))
-        self.update_parent_check_states(item)
-        self.blockSignals(False)
+        try:
+            self.update_child_check_states(item, item.checkState(0))
+            self.update_parent_check_states(item)
+        finally:
+            self.blockSignals(False)
+            self._in_check_update = False
 
         self.emit_checkbox_toggled()
 
@@ -1043,10 +1496,14 @@ class CustomTreeWidget(QTreeWidget):
         uid = self.get_item_uid(item)
         if uid:
             self.combo_values[uid] = text
-            # Update show_property in actors_df for the current uid
-            self.parent.actors_df.loc[
-                self.parent.actors_df["uid"] == uid, "show_property"
-            ] = text
+            # Update show_property in actors_df for the current uid with a
+            # positional write instead of a full-frame mask scan
+            row_pos = self._actors_row_position(uid)
+            if row_pos is not None:
+                show_property_col = self.parent.actors_df.columns.get_loc(
+                    "show_property"
+                )
+                self.parent.actors_df.iat[row_pos, show_property_col] = text
             self.parent.signals.propertyToggled.emit(
                 self.parent.collection.name, uid, text
             )
@@ -1074,15 +1531,38 @@ class CustomTreeWidget(QTreeWidget):
         toggle_action = menu.addAction("Toggle Checkboxes")
         action = menu.exec_(self.viewport().mapToGlobal(position))
         if action == toggle_action:
+            # Toggle the whole batch with signals blocked so each setCheckState
+            # does not fire itemChanged -> on_checkbox_changed individually;
+            # one aggregate emit at the end covers all of them
+            self.blockSignals(True)
             for item in self.selectedItems():
                 new_state = (
                     Qt.Checked if item.checkState(0) == Qt.Unchecked else Qt.Unchecked
                 )
                 item.setCheckState(0, new_state)
+                uid = self.get_item_uid(item)
+                if uid:
+                    self._last_check_state[uid] = new_state
+                    if new_state == Qt.Checked:
+                        self.checked_uids.add(uid)
+                    else:
+                        self.checked_uids.discard(uid)
                 self.update_child_check_states(item, new_state)
                 self.update_parent_check_states(item)
+            self.blockSignals(False)
             self.emit_checkbox_toggled()
 
+    def _schedule_resize_columns(self, *args):
+        """
+        Schedules a deferred :meth:`resize_columns` through the single-shot
+        resize timer, so bursts of expand/collapse events trigger one resize
+        instead of one per event. Arguments from the connected signals are
+        ignored.
+
+        :return: None
+        """
+        self._resize_timer.start()
+
     def resize_columns(self):
         """
         Adjusts the width of all columns in a table to fit the content within each column. It iterates over
@@ -1110,10 +1590,11 @@ class CustomTreeWidget(QTreeWidget):
         # Block signals temporarily to prevent unnecessary updates
         self.blockSignals(True)
 
-        for item in self.findItems("", Qt.MatchContains | Qt.MatchRecursive):
-            uid = self.get_item_uid(item)
-            if uid and uid in uids:
-                combo = self.itemWidget(item, self.columnCount() - 1)
+        last_col = self.columnCount() - 1
+        for uid in uids:
+            item = self._uid_to_item.get(uid)
+            if item:
+                combo = self.itemWidget(item, last_col)
                 if combo:
                     # Store current selection if it exists
                     current_text = combo.currentText()
@@ -1156,58 +1637,100 @@ class CustomTreeWidget(QTreeWidget):
         # Unblock signals
         self.blockSignals(False)
 
-    def get_item_uid(self, item):
+    def _actors_row_position(self, uid):
         """
-        Retrieves the unique identifier (UID) of a given item.
+        Returns the positional row index of a uid in the parent's actors_df as
+        an O(1) dict lookup, avoiding a boolean-mask scan of the whole frame
+        per access. The uid-to-position map is rebuilt whenever the parent
+        swaps in a different actors_df object or its length changes.
 
-        This function extracts the UID from the provided item's data stored
-        under a specific role identifier, `Qt.UserRole`.
+        :param uid: The unique identifier to look up.
+        :type uid: str
+        :return: The positional row index of the uid, or None if absent.
+        :rtype: int or None
+        """
+        actors_df = self.parent.actors_df
+        cache = self._actors_row_cache
+        if cache is None or cache[0] is not actors_df or cache[2] != len(actors_df):
+            positions = {u: i for i, u in enumerate(actors_df["uid"])}
+            cache = (actors_df, positions, len(actors_df))
+            self._actors_row_cache = cache
+        return cache[1].get(uid)
 
-        :param item: The item from which the UID will be extracted.
-                     Expected to be an instance of a class compatible with
-                     the `data` method, such as a `QTreeWidgetItem`.
-        :type item: Any
+    def _collection_row_position(self, uid):
+        """
+        Returns the positional row index of a uid in collection_df as an O(1)
+        dict lookup, mirroring :meth:`_actors_row_position`. The map is
+        rebuilt whenever collection_df is swapped for a different object or
+        its length changes.
 
-        :return: The unique identifier (UID) extracted from the item's
-                 data stored under the `Qt.UserRole`.
-        :rtype: Any
+        :param uid: The unique identifier to look up.
+        :type uid: str
+        :return: The positional row index of the uid, or None if absent.
+        :rtype: int or None
         """
-        return item.data(0, Qt.UserRole)
+        collection_df = self.collection_df
+        cache = self._collection_row_cache
+        if (
+            cache is None
+            or cache[0] is not collection_df
+            or cache[2] != len(collection_df)
+        ):
+            positions = {u: i for i, u in enumerate(collection_df[self.uid_label])}
+            cache = (collection_df, positions, len(collection_df))
+            self._collection_row_cache = cache
+        return cache[1].get(uid)
 
-    def _recursive_cleanup(self, item):
+    def get_item_uid(self, item):
         """
-        Recursively cleans up the provided item and its children in a tree-like structure.
-        This involves iterating through all children of the given item, cleaning up child
-        widgets, and removing them properly to ensure no memory leaks or dangling references.
+        Retrieves the unique identifier (UID) of a given item.
 
-        :param item: The root item to be cleaned up recursively. The function will process
-                     this item and all its child nodes.
+        This function reads the UID from the ``uid`` attribute set on leaf
+        items when they are built. Items without a UID (e.g. category items)
+        return ``None``.
+
+        :param item: The item from which the UID will be extracted.
+                     Expected to be a `QTreeWidgetItem`.
         :type item: Any
-        """
-        for i in range(item.childCount()):
-            child = item.child(i)
-            self._recursive_cleanup(child)
 
-        # Remove and delete the widget
-        widget = self.itemWidget(item, self.columnCount() - 1)
-        if widget:
-            widget.deleteLater()
-            self.removeItemWidget(item, self.columnCount() - 1)
+        :return: The unique identifier (UID) of the item, or ``None`` if the
+                 item carries no UID.
+        :rtype: Any
+        """
+        return getattr(item, "uid", None)
 
     def _cleanup_tree_widgets(self):
         """
-        Recursively cleans up tree widgets by accessing the root and its child items.
-
-        This method starts at the invisible root item of a tree widget structure and
-        performs cleanup operations recursively on all its child items using an
-        internal helper method.
+        Schedules deletion of the widgets attached to tree items by walking the
+        whole tree with an explicit stack. Reusing the combos in a pool is not
+        possible — the view deletes index widgets when their rows go away and
+        offers no way to detach them alive — so a single deleteLater per widget
+        is the cheapest correct teardown; the subsequent clear() deregisters
+        them from the view in one sweep, without a removeItemWidget call (and
+        the second scheduled deletion it implies) per node.
 
         :return: None
         """
         root = self.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
-            self._recursive_cleanup(item)
+        last_col = self.columnCount() - 1
+        stack = [root.child(i) for i in range(root.childCount())]
+        while stack:
+            item = stack.pop()
+            for i in range(item.childCount()):
+                stack.append(item.child(i))
+
+            widget = self.itemWidget(item, last_col)
+            if widget:
+                # Silence and disconnect the combo before it dies so its
+                # teardown cannot fire currentTextChanged into
+                # on_combo_changed, and the connected lambda stops keeping
+                # the dead item alive
+                widget.blockSignals(True)
+                try:
+                    widget.currentTextChanged.disconnect()
+                except (RuntimeError, TypeError):
+                    pass
+                widget.deleteLater()
 
     def _cleanup_empty_parents(self, item):
         """
@@ -1223,6 +1746,12 @@ class CustomTreeWidget(QTreeWidget):
 
         while item and item.childCount() == 0:
             parent = item.parent()
+            # Drop the removed item from the children index so its id cannot
+            # be matched against a recycled object later
+            self._children_index.pop(id(item), None)
+            bucket = self._children_index.get(id(parent)) if parent else None
+            if bucket:
+                bucket.pop(item.text(0), None)
             if parent:
                 parent.removeChild(item)
             else:
@@ -1,10 +1,13 @@
 """custom_tree_demo.py © Andrea Bistacchi"""
 
+import logging
+import os
 import sys
 import random
 import time
 
 from typing import List, Optional
+import numpy as np
 import pandas as pd
 from PySide6.QtWidgets import (
     QApplication,
@@ -13,12 +16,18 @@ from PySide6.QtWidgets import (
     QPushButton,
     QHBoxLayout,
     QMessageBox,
+    QSizePolicy,
 )
 
-from PySide6.QtCore import QObject, Qt
+from PySide6.QtCore import QObject, QSignalBlocker, Qt
 from PySide6.QtCore import Signal as pyqtSignal
 from custom_tree import CustomTreeWidget
 
+logger = logging.getLogger(__name__)
+
+# Post-add verification is debug-only; stripped when running with -O
+DEBUG_VERIFY = __debug__
+
 
 class CollectionSignals(QObject):
     """
@@ -97,6 +106,13 @@ class MainWindow(QWidget):
         self.uid_label = uid_label or "uid"  # Default to "uid" if None
         self.prop_label = prop_label or "properties"  # Default to "properties" if None
 
+        # Pre-sort by the hierarchy so the tree build sees one contiguous run
+        # of rows per group; mergesort is stable, preserving leaf order
+        if collection_df is not None and tree_labels:
+            collection_df = collection_df.sort_values(
+                tree_labels, kind="mergesort"
+            ).reset_index(drop=True)
+
         self._signals = MainWindowSignals()
 
         self.collection = Collection()
@@ -104,16 +120,24 @@ class MainWindow(QWidget):
         # self.collection.selected_uids = []
         self.collection.selected_uids = ["2", "4", "6"]
 
+        # Build actors_df in a single constructor call instead of assigning
+        # columns one by one on an empty frame; the fixture state columns are
+        # tiled so the frame scales with DEMO_ROWS
+        n_rows = len(collection_df)
         self.actors_df = pd.DataFrame(
-            columns=["uid", "actor", "show", "collection", "show_property"]
+            {
+                "uid": collection_df["uid"].to_numpy(),
+                "actor": collection_df["name"].to_numpy(),
+                # "show": True and "show_property": "none" for all rows would
+                # also work here (scalars broadcast)
+                "show": np.where(np.arange(n_rows) % 2 == 0, "True", "False"),
+                "collection": self.collection.name,
+                "show_property": np.tile(
+                    np.array(["none", "X", "Y", "Z", "none", "none"]),
+                    n_rows // 6 + 1,
+                )[:n_rows],
+            }
         )
-        self.actors_df["uid"] = collection_df["uid"]
-        self.actors_df["collection"] = self.collection.name
-        self.actors_df["actor"] = collection_df["name"]
-        # self.actors_df["show"] = True
-        # self.actors_df["show_property"] = "none"
-        self.actors_df["show"] = ["True", "False", "True", "False", "True", "False"]
-        self.actors_df["show_property"] = ["none", "X", "Y", "Z", "none", "none"]
 
         self.tree_widget = self._setup_tree_widget(
             collection_df,
@@ -154,58 +178,63 @@ class MainWindow(QWidget):
     def _setup_layout(self) -> None:
         """Set up the main window layout."""
         layout = QVBoxLayout(self)
+        # Zero margins/spacing and a fixed-height header keep expand/collapse
+        # from triggering extra layout passes over the whole window
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        self.tree_widget.header_widget.setSizePolicy(
+            QSizePolicy.Preferred, QSizePolicy.Fixed
+        )
         layout.addWidget(self.tree_widget.header_widget)
         layout.addWidget(self.tree_widget)
 
     def _on_items_selected(self, collection):
         """Handle items selection event."""
         uids = self.collection.selected_uids
-        print("Collection, selected uids:", collection, " - ", uids)
+        logger.debug("Collection, selected uids: %s - %s", collection, uids)
 
     def _on_checkbox_toggled(self, collection, turn_on_uids, turn_off_uids):
         """Handle checkbox toggle event."""
-        actors_df = self.actors_df
-        print(
-            "Collection, turn_on_uids, turn_off_uids, actors_df:",
+        logger.debug(
+            "Collection, turn_on_uids, turn_off_uids, actors_df: %s %s %s\n%s",
             collection,
             turn_on_uids,
             turn_off_uids,
-            "\n",
-            actors_df,
+            self.actors_df,
         )
 
     def _on_property_toggled(self, collection, changed_uid, changed_prop):
         """Handle property toggle event."""
-        actors_df = self.actors_df
-        print(
-            "Collection, changed_uid, changed_prop, actors_df:",
+        logger.debug(
+            "Collection, changed_uid, changed_prop, actors_df: %s %s %s\n%s",
             collection,
             changed_uid,
             changed_prop,
-            "\n",
-            actors_df,
+            self.actors_df,
         )
 
     def setup_signal_connections(self) -> None:
         """Setup signal connections for the main window's tree widget."""
-        self.collection.signals.itemsSelected.connect(self._on_items_selected)
+        # UniqueConnection guards against duplicate slots if this setup ever
+        # runs twice; same-thread delivery already resolves to a direct call
+        self.collection.signals.itemsSelected.connect(
+            self._on_items_selected, Qt.UniqueConnection
+        )
         self.signals.checkboxToggled.connect(
-            lambda collection, turn_on_uids, turn_off_uids: self._on_checkbox_toggled(
-                collection, turn_on_uids, turn_off_uids
-            )
+            self._on_checkbox_toggled, Qt.UniqueConnection
         )
         self.signals.propertyToggled.connect(
-            lambda collection, changed_uid, changed_prop: self._on_property_toggled(
-                collection, changed_uid, changed_prop
-            )
+            self._on_property_toggled, Qt.UniqueConnection
         )
         # new connection for selection change
-        self.signals.newSelection.connect(self.tree_widget.set_selection_from_uids)
+        self.signals.newSelection.connect(
+            self.tree_widget.set_selection_from_uids, Qt.UniqueConnection
+        )
 
     def test_add_random_items(self):
         """Test function that adds random items to the tree and measures performance."""
-        # Get the maximum current UID
-        current_max_uid = max(int(uid) for uid in self.actors_df["uid"])
+        # Get the maximum current UID with a C-level cast and reduction
+        current_max_uid = int(self.actors_df["uid"].astype(np.int64).max())
 
         # Get original data structure
         orig_df = self.tree_widget.collection_df
@@ -213,23 +242,34 @@ class MainWindow(QWidget):
         # Create new random data entries (between 1 and 5)
         num_to_add = random.randint(1, 5)
 
-        # Create new entries by randomly shuffling values within each column
-        new_entries = []
-        for i in range(num_to_add):
-            new_uid = str(current_max_uid + i + 1)
-            new_entry = {
-                "role": random.choice(orig_df["role"].tolist()),
-                "topology": random.choice(orig_df["topology"].tolist()),
-                "feature": random.choice(orig_df["feature"].tolist()),
-                "scenario": random.choice(orig_df["scenario"].tolist()),
-                "name": f"New_Feature_{new_uid}",
-                "uid": new_uid,
-                "properties": random.choice(orig_df["properties"].tolist()).copy(),
-            }
-            new_entries.append(new_entry)
-
-        # Create DataFrame from new entries
-        new_df = pd.DataFrame(new_entries)
+        # Fabricate all new uids and names in one vectorized pass each
+        new_uid_arr = (current_max_uid + 1 + np.arange(num_to_add)).astype(str)
+        new_uids = new_uid_arr.tolist()
+        new_names = np.char.add("New_Feature_", new_uid_arr)
+
+        # Materialize each column pool once instead of once per iteration
+        role_pool = orig_df["role"].tolist()
+        topo_pool = orig_df["topology"].tolist()
+        feat_pool = orig_df["feature"].tolist()
+        scen_pool = orig_df["scenario"].tolist()
+        props_pool = orig_df["properties"].tolist()
+
+        # Build the new rows column-wise: one batched random.choices call per
+        # column and a single DataFrame constructor, no per-row dicts
+        new_df = pd.DataFrame(
+            {
+                "role": random.choices(role_pool, k=num_to_add),
+                "topology": random.choices(topo_pool, k=num_to_add),
+                "feature": random.choices(feat_pool, k=num_to_add),
+                "scenario": random.choices(scen_pool, k=num_to_add),
+                "name": new_names,
+                "uid": new_uids,
+                "properties": [
+                    random.choice(props_pool).copy() for _ in range(num_to_add)
+                ],
+            },
+            columns=orig_df.columns,
+        )
 
         print(f"\nTesting addition of {num_to_add} items...")
         print(f"New entries:\n{new_df}")
@@ -237,29 +277,21 @@ class MainWindow(QWidget):
         # Measure time
         start_time = time.time()
 
-        # Update tree widget's collection_df
-        self.tree_widget.collection_df = pd.concat(
-            [self.tree_widget.collection_df, new_df], ignore_index=True
-        )
-
-        # Add items to tree widget
-        used_individual_add = self.tree_widget.add_items_to_tree(new_df["uid"].tolist())
+        # Update the widget's collection_df and insert the items in one call
+        used_individual_add = self.tree_widget.add_items_batch(new_df)
 
         # Update actors_df with new entries - ensure "show" values are strings
         new_actors = pd.DataFrame(
             {
                 "uid": new_df["uid"],
                 "actor": new_df["name"],
-                "show": [
-                    "True" for _ in range(len(new_df))
-                ],  # Explicitly using string "True"
-                "collection": [self.collection.name] * len(new_df),
-                "show_property": ["none"] * len(new_df),
+                # Scalars broadcast to the frame length; "show" stays the
+                # string "True" because the widget normalizes it with str()
+                "show": "True",
+                "collection": self.collection.name,
+                "show_property": "none",
             }
         )
-
-        # Convert show column to string type to ensure consistency
-        new_actors["show"] = new_actors["show"].astype(str)
         self.actors_df = pd.concat([self.actors_df, new_actors], ignore_index=True)
 
         end_time = time.time()
@@ -270,16 +302,14 @@ class MainWindow(QWidget):
             f"Method used: {'Individual add' if used_individual_add else 'Complete rebuild'}"
         )
 
-        # Verify items were added
-        for uid in new_df["uid"]:
-            found = False
-            for item in self.tree_widget.findItems(
-                "", Qt.MatchContains | Qt.MatchRecursive
-            ):
-                if self.tree_widget.get_item_uid(item) == uid:
-                    found = True
-                    break
-            print(f"UID {uid}: {'✓ Added successfully' if found else '✗ Not found!'}")
+        # Verify items were added via the widget's uid registry instead of a
+        # full findItems walk per uid
+        if DEBUG_VERIFY:
+            for uid in new_df["uid"]:
+                found = uid in self.tree_widget._uid_to_item
+                print(
+                    f"UID {uid}: {'✓ Added successfully' if found else '✗ Not found!'}"
+                )
 
     def test_remove_random_items(self):
         """Test function to remove random items from the tree"""
@@ -319,10 +349,9 @@ class MainWindow(QWidget):
 
         # Get first item's current properties from collection_df - with safety checks
         first_uid = selected_uids[0]
-        mask = self.tree_widget.collection_df[self.uid_label] == first_uid
-        matching_rows = self.tree_widget.collection_df[mask]
+        row_pos = self.tree_widget._collection_row_position(first_uid)
 
-        if matching_rows.empty:
+        if row_pos is None:
             QMessageBox.warning(
                 self,
                 "Error",
@@ -330,7 +359,7 @@ class MainWindow(QWidget):
             )
             return
 
-        current_props = matching_rows[self.prop_label].iloc[0]
+        current_props = self.tree_widget.collection_df[self.prop_label].iat[row_pos]
 
         # Alternate between adding and removing a property
         if isinstance(current_props, list):
@@ -345,34 +374,42 @@ class MainWindow(QWidget):
             # Handle case where current_props is not a list
             new_props = ["new_prop_1"]
 
-        # Update properties in the DataFrame using at[] to handle lists
-        for uid in selected_uids:
-            mask = self.tree_widget.collection_df[self.uid_label] == uid
-            matching_rows = self.tree_widget.collection_df[mask]
-            if not matching_rows.empty:
-                idx = matching_rows.index[0]
-                self.tree_widget.collection_df.at[idx, self.prop_label] = (
-                    new_props.copy()
-                )
-
-        # Update the tree widget's combo boxes
-        items = self.tree_widget.findItems("", Qt.MatchContains | Qt.MatchRecursive)
-        for item in items:
-            item_uid = self.tree_widget.get_item_uid(item)
-            if item_uid in selected_uids:
-                combo = self.tree_widget.itemWidget(
-                    item, self.tree_widget.columnCount() - 1
-                )
+        # Update properties in the DataFrame with a single vectorized mask;
+        # the per-index loop stays because each cell stores a Python list
+        collection_df = self.tree_widget.collection_df
+        mask = collection_df[self.uid_label].isin(selected_uids)
+        for idx in collection_df.index[mask]:
+            collection_df.at[idx, self.prop_label] = new_props.copy()
+
+        # Update the combo boxes of the selected uids only, with repaints
+        # suspended for the whole batch and per-combo signals silenced so the
+        # clear/addItems churn does not cascade into on_combo_changed
+        # Hoist the loop-invariant lookups once
+        last_col = self.tree_widget.columnCount() - 1
+        combo_items = ["none"] + self.tree_widget.default_labels + new_props
+        get_item = self.tree_widget._uid_to_item.get
+        item_widget = self.tree_widget.itemWidget
+        self.tree_widget.setUpdatesEnabled(False)
+        try:
+            for uid in selected_uids:
+                item = get_item(uid)
+                if item is None:
+                    continue
+                combo = item_widget(item, last_col)
                 if combo:
                     current_value = combo.currentText()
-                    combo.clear()
-                    combo.addItems(
-                        ["none"] + self.tree_widget.default_labels + new_props
-                    )
-                    # Try to restore the previous selection if it still exists
-                    index = combo.findText(current_value)
-                    if index >= 0:
-                        combo.setCurrentIndex(index)
+                    with QSignalBlocker(combo):
+                        combo.clear()
+                        combo.addItems(combo_items)
+                        # Try to restore the previous selection if it still exists
+                        index = combo.findText(current_value)
+                        if index >= 0:
+                            combo.setCurrentIndex(index)
+                    # If the previous value is gone, sync the widget state once
+                    if combo.currentText() != current_value:
+                        self.tree_widget.on_combo_changed(item, combo.currentText())
+        finally:
+            self.tree_widget.setUpdatesEnabled(True)
 
     def test_random_selection(self):
         """Test function to emit random selection of UIDs."""
@@ -417,51 +454,78 @@ class MainWindow(QWidget):
 
 
 def create_test_data() -> pd.DataFrame:
-    """Create sample data for testing the tree widget."""
+    """Create sample data for testing the tree widget.
+
+    The row count can be scaled with the DEMO_ROWS environment variable
+    (default 6) to stress-test the widget; the six base rows are tiled with
+    vectorized NumPy ops and uids stay unique.
+    """
+    n = int(os.environ.get("DEMO_ROWS", "6"))
+    base_role = ["fault", "top", "top", "fault", "top", "top"]
+    base_topology = [
+        "PolyLine",
+        "PolyLine",
+        "TriSurf",
+        "PolyLine",
+        "PolyLine",
+        "TriSurf",
+    ]
+    base_feature = [
+        "Triassic",
+        "Jurassic",
+        "Triassic",
+        "Triassic",
+        "Jurassic",
+        "Triassic",
+    ]
+    base_scenario = [
+        "preliminary",
+        "final",
+        "preliminary",
+        "preliminary",
+        "final",
+        "preliminary",
+    ]
+    base_name = ["Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta"]
+    base_properties = [
+        ["a", "aa", "aaa"],
+        ["b", "bb"],
+        ["c", "cc"],
+        ["d", "dd", "ddd"],
+        ["eee"],
+        ["fff"],
+    ]
+    reps = -(-n // 6)
+
+    def tiled(values):
+        return np.tile(np.array(values, dtype=object), reps)[:n].tolist()
+
+    uids = np.arange(1, n + 1).astype(str)
+    if n == 6:
+        names = base_name
+    else:
+        # Suffix the tiled names with the uid so leaves stay distinguishable
+        names = np.char.add(
+            np.char.add(np.tile(np.array(base_name), reps)[:n], "_"), uids
+        ).tolist()
     return pd.DataFrame(
         {
-            "role": ["fault", "top", "top", "fault", "top", "top"],
-            "topology": [
-                "PolyLine",
-                "PolyLine",
-                "TriSurf",
-                "PolyLine",
-                "PolyLine",
-                "TriSurf",
-            ],
-            "feature": [
-                "Triassic",
-                "Jurassic",
-                "Triassic",
-                "Triassic",
-                "Jurassic",
-                "Triassic",
-            ],
-            "scenario": [
-                "preliminary",
-                "final",
-                "preliminary",
-                "preliminary",
-                "final",
-                "preliminary",
-            ],
-            "name": ["Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta"],
-            "uid": ["1", "2", "3", "4", "5", "6"],
-            "properties": [
-                ["a", "aa", "aaa"],
-                ["b", "bb"],
-                ["c", "cc"],
-                ["d", "dd", "ddd"],
-                ["eee"],
-                ["fff"],
-            ],
+            "role": tiled(base_role),
+            "topology": tiled(base_topology),
+            "feature": tiled(base_feature),
+            "scenario": tiled(base_scenario),
+            "name": names,
+            "uid": uids.tolist(),
+            "properties": [base_properties[i % 6].copy() for i in range(n)],
         }
     )
 
 
 def main() -> None:
     """Main application entry point."""
-    app = QApplication(sys.argv)
+    # Reuse an existing QApplication if one is running, and pass only the
+    # program name so Qt skips parsing the whole command line
+    app = QApplication.instance() or QApplication(sys.argv[:1])
 
     tree_labels = ["role", "topology", "feature", "scenario"]
     name_label = "name"
@@ -470,6 +534,11 @@ def main() -> None:
     default_labels = ["none", "X", "Y", "Z"]
     collection_df = create_test_data()
 
+    # Store the grouping columns as categoricals: one shared categories array
+    # plus small integer codes per row, which the widget's groupby exploits
+    for col in tree_labels:
+        collection_df[col] = collection_df[col].astype("category")
+
     main_window = MainWindow(
         collection_df=collection_df,
         tree_labels=tree_labels,
@@ -480,7 +549,11 @@ def main() -> None:
     )
     main_window.show()
 
-    sys.exit(app.exec())
+    # Demo-only teardown: skip Python finalization of the widget tree after
+    # the event loop ends, which is slow and occasionally crashy on exit
+    ret = app.exec()
+    sys.stdout.flush()
+    os._exit(ret)
 
 
 if __name__ == "__main__":